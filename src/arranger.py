@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import datetime
+import enum
+import os
+from typing import Iterable, Iterator
+
+from src.date import DATE_MAX, Date
+from src.parse_date import parse_date
+
+# Heavy dependencies (filetype, pytz, shutil) are imported lazily, where they
+# are first needed, so that importing this module and starting the CLI stay
+# cheap.
+
+DEFAULT_TIME_ZONE = "Europe/Paris"
+
+
+class Layout(enum.Enum):
+    """
+    Layouts that can be used to store the parsed files in the output
+    directory.
+    """
+    # All the files in the output directory.
+    FLAT = "flat"
+    # One sub-directory per year (e.g. "2022/").
+    YEAR = "year"
+    # One sub-directory per year and month (e.g. "2022/02/").
+    YEAR_MONTH = "year_month"
+
+
+class Mode(enum.Enum):
+    """
+    Modes that can be used to store the parsed files in the output directory.
+    """
+    COPY = "copy"
+    MOVE = "move"
+
+
+class Status(enum.Enum):
+    """
+    Outcomes of the processing of a single file.
+    """
+    # The file is a media and was stored in the output directory.
+    ARRANGED = "arranged"
+    # The file is not a media and was left untouched.
+    SKIPPED = "skipped"
+    # The file could not be processed (see :func:`ArrangeResult.get_error`).
+    FAILED = "failed"
+
+
+class ArrangeResult:
+    """
+    The result of the processing of a single file by an :func:`Arranger`.
+    """
+
+    def __init__(self,
+                 source: str,
+                 status: Status,
+                 destination: str = None,
+                 date: Date = None,
+                 error: Exception = None) -> None:
+        self.__source = source
+        self.__status = status
+        self.__destination = destination
+        self.__date = date
+        self.__error = error
+
+    def get_source(self) -> str:
+        return self.__source
+
+    def get_status(self) -> Status:
+        return self.__status
+
+    def get_destination(self) -> str | None:
+        return self.__destination
+
+    def get_date(self) -> Date | None:
+        return self.__date
+
+    def get_error(self) -> Exception | None:
+        return self.__error
+
+    def __repr__(self) -> str:
+        return "ArrangeResult(%r, %s, %r, %s, %r)" % (
+            self.__source, self.__status.name, self.__destination,
+            self.__date, self.__error)
+
+
+class Arranger:
+    """
+    Parse scattered media files in trees to store them in a same directory,
+    using a naming convention based on their creation time.
+    """
+
+    def __init__(self,
+                 input_paths: str | Iterable[str],
+                 output_path: str,
+                 time_zone: str = DEFAULT_TIME_ZONE,
+                 layout: Layout = Layout.FLAT,
+                 mode: Mode = Mode.COPY) -> None:
+        """
+        :param input_paths: A path, or paths, to the root directory of a tree
+            structure to be parsed.
+        :param output_path: A path to an existing directory that will be used
+            to store the parsed files.
+        :param time_zone: A time zone name (e.g. "Europe/Paris") used to read
+            the file system creation time.
+        :param layout: A :func:`Layout` of the output directory.
+        :param mode: A :func:`Mode` used to store the parsed files.
+        :raise ValueError: If a path is empty, does not exist or is not a
+            directory, or if the time zone is unknown.
+        """
+        if isinstance(input_paths, str):
+            input_paths = [input_paths]
+        input_paths = list(input_paths)
+        Arranger.__check_args(input_paths, output_path, layout, mode)
+        self.__input_paths = input_paths
+        self.__output_path = output_path
+        self.__time_zone = time_zone
+        self.__tz = Arranger.__get_tz(time_zone)
+        self.__layout = layout
+        self.__mode = mode
+
+    @staticmethod
+    def __check_args(input_paths: list[str],
+                     output_path: str,
+                     layout: Layout,
+                     mode: Mode) -> None:
+        if not input_paths:
+            raise ValueError("No input path given.")
+        for input_path in input_paths:
+            Arranger.__check_dir(input_path, "Input path")
+        Arranger.__check_dir(output_path, "Output path")
+        if not isinstance(layout, Layout):
+            raise ValueError("Invalid layout (must be a Layout).")
+        if not isinstance(mode, Mode):
+            raise ValueError("Invalid mode (must be a Mode).")
+
+    @staticmethod
+    def __check_dir(path: str, name: str) -> None:
+        if not path:
+            raise ValueError("%s is empty." % name)
+        if not os.path.exists(path):
+            raise ValueError("%s does not exist: %s." % (name, path))
+        if not os.path.isdir(path):
+            raise ValueError("%s is not a directory: %s." % (name, path))
+
+    @staticmethod
+    def __get_tz(time_zone: str) -> datetime.tzinfo:
+        import pytz
+
+        try:
+            return pytz.timezone(time_zone)
+        except pytz.UnknownTimeZoneError:
+            raise ValueError("Invalid time zone: %s." % time_zone) from None
+
+    def get_input_paths(self) -> list[str]:
+        return list(self.__input_paths)
+
+    def get_output_path(self) -> str:
+        return self.__output_path
+
+    def get_time_zone(self) -> str:
+        return self.__time_zone
+
+    def get_layout(self) -> Layout:
+        return self.__layout
+
+    def get_mode(self) -> Mode:
+        return self.__mode
+
+    def arrange(self) -> Iterator[ArrangeResult]:
+        """
+        Parse the input trees, find media files, rename them, and store them
+        in the output directory. Files are processed lazily, as the returned
+        iterator is consumed. A file that can't be processed (e.g. not
+        readable) yields a :data:`Status.FAILED` result, and the parsing goes
+        on with the next files. The output directory is never parsed, even
+        when it is inside an input tree.
+
+        :return: An iterator of :func:`ArrangeResult`, one per parsed file.
+        """
+        import filetype
+
+        output_path = os.path.realpath(self.__output_path)
+
+        # Parse all the directories in the given trees.
+        for input_path in self.__input_paths:
+            for root, dirs, files in os.walk(input_path):
+                # Don't parse the files already stored in the output dir.
+                dirs[:] = [
+                    d for d in dirs
+                    if os.path.realpath(os.path.join(root, d)) != output_path
+                ]
+                # Parse all the file in the current directory.
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    try:
+                        # Check if the file is a media.
+                        if filetype.is_image(file_path) or \
+                                filetype.is_video(file_path):
+                            result = self.__arrange_file(file_path, file)
+                        else:
+                            result = ArrangeResult(file_path, Status.SKIPPED)
+                    except (OSError, ValueError) as e:
+                        result = ArrangeResult(file_path, Status.FAILED,
+                                               error=e)
+                    yield result
+
+    def __arrange_file(self, file_path: str, file: str) -> ArrangeResult:
+        import shutil
+
+        file_name, file_extension = os.path.splitext(file)
+        # Get the creation time of the file.
+        date = self.extract_creation_time(file_path, file_name)
+        # Define the path to the output dir using the new name.
+        output_dir = self.__get_output_dir(date)
+        destination = Arranger.__get_destination(
+            file_path, os.path.join(output_dir, str(date)), file_extension)
+        # Store the file to the new path, unless it is already there.
+        if os.path.exists(destination):
+            pass
+        elif self.__mode is Mode.MOVE:
+            shutil.move(file_path, destination)
+        else:
+            shutil.copy(file_path, destination)
+        return ArrangeResult(file_path, Status.ARRANGED, destination, date)
+
+    @staticmethod
+    def __get_destination(file_path: str, name: str, extension: str) -> str:
+        # Add a suffix (e.g. "_1") to the name while it is used by another
+        # file (i.e. files with the same date), so that none is overwritten.
+        destination = "%s%s" % (name, extension)
+        i = 0
+        while os.path.exists(destination) and \
+                not os.path.samefile(file_path, destination):
+            i += 1
+            destination = "%s_%d%s" % (name, i, extension)
+        return destination
+
+    def __get_output_dir(self, date: Date) -> str:
+        year = "%04d" % (date.get_year() or 0)
+        month = "%02d" % (date.get_month() or 0)
+
+        if self.__layout is Layout.YEAR:
+            output_dir = os.path.join(self.__output_path, year)
+        elif self.__layout is Layout.YEAR_MONTH:
+            output_dir = os.path.join(self.__output_path, year, month)
+        else:
+            return self.__output_path
+
+        os.makedirs(output_dir, exist_ok=True)
+        return output_dir
+
+    def get_creation_time(self, path: str) -> Date:
+        """
+        Get the creation time of a file using file system.
+
+        :param path: A path to an existing file.
+        :return: A date.
+        """
+        t = os.stat(path).st_ctime
+        t = datetime.datetime.fromtimestamp(t, tz=self.__tz)
+        return Date.create_from_datetime(t)
+
+    def extract_creation_time(self, path: str, name: str) -> Date:
+        """
+        Extract the file creation time, using metadata from the file system,
+        and metadata from the file name.
+
+        :param path: A path to an existing file.
+        :param name: A name of an existing file.
+        :return: A date.
+        """
+        # Get file system creation time.
+        creation_time_fs = self.get_creation_time(path)
+        # Get file name creation time; a name with an out of range date
+        # (e.g. "a1_2022_02_26") is ignored.
+        try:
+            creation_time_fn = parse_date(name)
+        except ValueError:
+            creation_time_fn = None
+        if not creation_time_fn:
+            creation_time_fn = DATE_MAX
+        # Return the lowest date.
+        return min(creation_time_fs, creation_time_fn)
@@ -1,15 +1,8 @@
-import datetime
 import logging
 import os
-import pathlib
-import shutil
 import sys
 
-import filetype
-import pytz
-
-from src.date import DATE_MAX, Date
-from src.parse_date import parse_date
+from src.arranger import Arranger, Status
 
 _FILE_FORMAT = "%Y:%m:%d_%H:%M:%S:%f"
 _TIME_ZONE = "Europe/Paris"
@@ -73,8 +66,8 @@ def set_logger() -> None:
 def parse_pictures_and_videos(dir_to_be_parsed: str,
                               dir_to_store_parsed_files: str) -> None:
     """
-    Parse the given tree, find media files, rename them, and store them in the
-    given directory.
+    Arrange the media files of the given tree in the given directory, using
+    :func:`arranger.Arranger`, and log the result of each file.
 
     :param dir_to_be_parsed: A path to the root directory of a tree
         structure to be parsed,
@@ -82,69 +75,29 @@ def parse_pictures_and_videos(dir_to_be_parsed: str,
         will be used to store the parsed files.
     :return: None.
     """
-    # Parse all the directories in the given tree.
-    for root, dirs, files in os.walk(dir_to_be_parsed):
-        logging.debug("> Parsing %s" % root)
-        # Parse all the file in the current directory.
-        for file in files:
-            # Get the full file path and its extension.
-            file_path = os.path.join(root, file)
-            file_name, file_extension = os.path.splitext(file)
-            # Check if the file is a media.
-            if filetype.is_image(file_path) or filetype.is_video(file_path):
-                # Get the creation time of the file.
-                file_time_of_creation = extract_creation_time(file_path,
-                                                              file_name)
-                # Define the path to the output dir using the new name.
-                file_path_new_name = "%s%s" % (
-                    os.path.join(dir_to_store_parsed_files,
-                                 str(file_time_of_creation)),
-                    file_extension,
-                )
-                # Copy the file to the new path.
-                shutil.copy(file_path, file_path_new_name)
-                logging.debug(
-                    "\tOK: %s - renamed to %s." % (
-                        file_path, file_time_of_creation)
-                )
-            else:
-                logging.debug("\tKO: %s - not a media." % file_path)
-
-
-def get_creation_time(path: str) -> Date:
-    """
-    Get the creation time of a file using file system.
-
-    :param path: A path to an existing file.
-    :return: A date.
-    """
-    f = pathlib.Path(path)
-    t = f.stat().st_ctime
-    t = datetime.datetime.fromtimestamp(
-        t,
-        tz=pytz.timezone(_TIME_ZONE),
-    )
-    return Date.create_from_datetime(t)
-
-
-def extract_creation_time(path: str, name: str) -> Date:
-    """
-    Extract the file creation time, using metadata from the file system,
-    and metadata from the file name.
-
-    :param path: A path to an existing file.
-    :param name: A name of an existing file.
-    :return: A date.
-    """
-    # Get file system creation time.
-    creation_time_fs = get_creation_time(path)
-    # Get file name creation time.
-    print(name)
-    creation_time_fn = parse_date(name)
-    if not creation_time_fn:
-        creation_time_fn = DATE_MAX
-    # Return the lowest date.
-    return min(creation_time_fs, creation_time_fn)
+    arranger = Arranger(dir_to_be_parsed,
+                        dir_to_store_parsed_files,
+                        time_zone=_TIME_ZONE)
+    current_dir = None
+
+    for result in arranger.arrange():
+        # Log each directory once, when its first file is reached.
+        root = os.path.dirname(result.get_source())
+        if root != current_dir:
+            current_dir = root
+            logging.debug("> Parsing %s" % root)
+
+        if result.get_status() is Status.ARRANGED:
+            logging.debug(
+                "\tOK: %s - renamed to %s." % (
+                    result.get_source(), result.get_date())
+            )
+        elif result.get_status() is Status.FAILED:
+            logging.error(
+                "\tKO: %s - %s." % (result.get_source(), result.get_error())
+            )
+        else:
+            logging.debug("\tKO: %s - not a media." % result.get_source())
 
 
 def main():
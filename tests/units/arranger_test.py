@@ -0,0 +1,266 @@
+import os
+import subprocess
+import sys
+import struct
+import tempfile
+import unittest
+import zlib
+
+from src.arranger import Arranger, Layout, Mode, Status
+
+
+def _png() -> bytes:
+    """
+    :return: The content of a 1x1 PNG image.
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + \
+            struct.pack(">I", zlib.crc32(kind + data))
+
+    return b"\x89PNG\r\n\x1a\n" + \
+        chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)) + \
+        chunk(b"IDAT", zlib.compress(b"\x00\x00")) + \
+        chunk(b"IEND", b"")
+
+
+def _write(path: str, content: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+class ArrangerTest(unittest.TestCase):
+
+    def test__init(self):
+
+        def raise_error_when_invalid_paths():
+            with tempfile.TemporaryDirectory() as d:
+                file = os.path.join(d, "file.txt")
+                open(file, "w").close()
+                missing = os.path.join(d, "missing")
+
+                for input_paths, output_path in [
+                    ([], d),
+                    ("", d),
+                    (d, ""),
+                    (missing, d),
+                    (d, missing),
+                    (file, d),
+                    (d, file),
+                    ([d, missing], d),
+                ]:
+                    with self.assertRaises(ValueError):
+                        Arranger(input_paths, output_path)
+
+        def raise_error_when_invalid_layout_or_mode():
+            with tempfile.TemporaryDirectory() as d:
+                with self.assertRaises(ValueError):
+                    Arranger(d, d, layout="flat")
+                with self.assertRaises(ValueError):
+                    Arranger(d, d, mode="copy")
+
+        def keep_given_config():
+            with tempfile.TemporaryDirectory() as d:
+                arranger = Arranger(d, d)
+                self.assertEqual(arranger.get_input_paths(), [d])
+                self.assertEqual(arranger.get_output_path(), d)
+                self.assertEqual(arranger.get_time_zone(), "Europe/Paris")
+                self.assertIs(arranger.get_layout(), Layout.FLAT)
+                self.assertIs(arranger.get_mode(), Mode.COPY)
+
+                arranger = Arranger((d, d), d, "UTC", Layout.YEAR, Mode.MOVE)
+                self.assertEqual(arranger.get_input_paths(), [d, d])
+                self.assertEqual(arranger.get_time_zone(), "UTC")
+                self.assertIs(arranger.get_layout(), Layout.YEAR)
+                self.assertIs(arranger.get_mode(), Mode.MOVE)
+
+        def raise_error_when_invalid_time_zone():
+            with tempfile.TemporaryDirectory() as d:
+                with self.assertRaises(ValueError):
+                    Arranger(d, d, time_zone="Nope/Zone")
+
+        raise_error_when_invalid_paths()
+        raise_error_when_invalid_layout_or_mode()
+        raise_error_when_invalid_time_zone()
+        keep_given_config()
+
+    def test__arrange(self):
+        name = "20220226_101010_000000.png"
+
+        def arrange(layout: Layout = Layout.FLAT,
+                    mode: Mode = Mode.COPY,
+                    roots: int = 1) -> None:
+            with tempfile.TemporaryDirectory() as d:
+                output = os.path.join(d, "out")
+                os.mkdir(output)
+                inputs = [os.path.join(d, "in%d" % i) for i in range(roots)]
+                images = [
+                    _write(os.path.join(i, "sub", "IMG_2022022%d_101010.png"
+                                        % (6 - n)), _png())
+                    for n, i in enumerate(inputs)
+                ]
+                text = _write(os.path.join(inputs[0], "notes.txt"), b"notes")
+
+                results = {
+                    r.get_source(): r
+                    for r in Arranger(inputs, output,
+                                      layout=layout, mode=mode).arrange()
+                }
+                self.assertEqual(set(results), set(images + [text]))
+
+                result = results[text]
+                self.assertIs(result.get_status(), Status.SKIPPED)
+                self.assertIsNone(result.get_destination())
+                self.assertTrue(os.path.exists(text))
+
+                for n, image in enumerate(images):
+                    result = results[image]
+                    self.assertIs(result.get_status(), Status.ARRANGED)
+                    self.assertIsNone(result.get_error())
+                    directory = {
+                        Layout.FLAT: output,
+                        Layout.YEAR: os.path.join(output, "2022"),
+                        Layout.YEAR_MONTH: os.path.join(output, "2022", "02"),
+                    }[layout]
+                    destination = os.path.join(
+                        directory, name.replace("26", "2%d" % (6 - n), 1))
+                    self.assertEqual(result.get_destination(), destination)
+                    self.assertTrue(os.path.isfile(destination))
+                    self.assertEqual(os.path.exists(image),
+                                     mode is Mode.COPY)
+
+        def return_results_when_flat_layout():
+            arrange(Layout.FLAT)
+
+        def store_in_year_dir_when_year_layout():
+            arrange(Layout.YEAR)
+
+        def store_in_month_dir_when_year_month_layout():
+            arrange(Layout.YEAR_MONTH)
+
+        def keep_source_when_copy_mode():
+            arrange(mode=Mode.COPY)
+
+        def remove_source_when_move_mode():
+            arrange(mode=Mode.MOVE)
+
+        def walk_every_root_when_several_inputs():
+            arrange(roots=3)
+
+        def go_on_when_a_file_fails():
+            with tempfile.TemporaryDirectory() as d:
+                # A broken link can't be read.
+                broken = os.path.join(d, "broken.png")
+                os.symlink(os.path.join(d, "missing.png"), broken)
+                other = _write(os.path.join(d, "sub", "IMG_20220225.png"),
+                               _png())
+
+                results = {r.get_source(): r
+                           for r in Arranger(d, d).arrange()}
+                self.assertEqual(set(results), {broken, other})
+
+                result = results[broken]
+                self.assertIs(result.get_status(), Status.FAILED)
+                self.assertIsInstance(result.get_error(), OSError)
+                self.assertIsNone(result.get_destination())
+                self.assertIs(results[other].get_status(), Status.ARRANGED)
+
+        def use_file_system_date_when_invalid_date_in_name():
+            with tempfile.TemporaryDirectory() as d:
+                output = os.path.join(d, "out")
+                os.mkdir(output)
+                # Parsed as year 1202, which is out of range.
+                image = _write(os.path.join(d, "in", "a1_2022_02_26.png"),
+                               _png())
+                other = _write(os.path.join(d, "in", "IMG_20220225.png"),
+                               _png())
+
+                results = {r.get_source(): r for r in
+                           Arranger(os.path.join(d, "in"), output).arrange()}
+                self.assertEqual(set(results), {image, other})
+
+                for result in results.values():
+                    self.assertIs(result.get_status(), Status.ARRANGED)
+                self.assertEqual(results[image].get_date(),
+                                 Arranger(d, d).get_creation_time(image))
+
+        def keep_every_file_when_same_date():
+            with tempfile.TemporaryDirectory() as d:
+                output = os.path.join(d, "out")
+                os.mkdir(output)
+                images = [
+                    _write(os.path.join(d, "in", sub, "IMG_20220226.png"),
+                           _png())
+                    for sub in ("a", "b")
+                ]
+
+                results = list(Arranger(os.path.join(d, "in"), output,
+                                        mode=Mode.MOVE).arrange())
+                self.assertEqual(len(results), 2)
+                for result in results:
+                    self.assertIs(result.get_status(), Status.ARRANGED)
+                    self.assertFalse(os.path.exists(result.get_source()))
+                self.assertEqual(
+                    sorted(r.get_destination() for r in results),
+                    [os.path.join(output, "20220226_000000_000000.png"),
+                     os.path.join(output, "20220226_000000_000000_1.png")])
+                self.assertEqual(len(os.listdir(output)), len(images))
+
+        def do_not_parse_output_dir_when_inside_input():
+            for layout in Layout:
+                with tempfile.TemporaryDirectory() as d:
+                    output = os.path.join(d, "out")
+                    os.mkdir(output)
+                    image = _write(os.path.join(d, "IMG_20220226.png"),
+                                   _png())
+                    stored = _write(os.path.join(output, "stored.png"),
+                                    _png())
+
+                    results = list(Arranger(d, output,
+                                            layout=layout).arrange())
+                    self.assertEqual([r.get_source() for r in results],
+                                     [image])
+                    self.assertIs(results[0].get_status(), Status.ARRANGED)
+                    self.assertTrue(os.path.exists(stored))
+
+        def do_nothing_when_already_arranged():
+            with tempfile.TemporaryDirectory() as d:
+                image = _write(os.path.join(d, name), _png())
+
+                results = list(Arranger(d, d, mode=Mode.MOVE).arrange())
+                self.assertEqual(len(results), 1)
+                self.assertIs(results[0].get_status(), Status.ARRANGED)
+                self.assertEqual(results[0].get_destination(), image)
+                self.assertEqual(os.listdir(d), [name])
+
+        return_results_when_flat_layout()
+        store_in_year_dir_when_year_layout()
+        store_in_month_dir_when_year_month_layout()
+        keep_source_when_copy_mode()
+        remove_source_when_move_mode()
+        walk_every_root_when_several_inputs()
+        go_on_when_a_file_fails()
+        use_file_system_date_when_invalid_date_in_name()
+        keep_every_file_when_same_date()
+        do_not_parse_output_dir_when_inside_input()
+        do_nothing_when_already_arranged()
+
+    def test__import(self):
+
+        def do_not_import_heavy_dependencies():
+            code = "import sys\n" \
+                   "import src.main\n" \
+                   "heavy = {'filetype', 'pytz', 'shutil'}\n" \
+                   "print(sorted(heavy & set(sys.modules)))"
+            root = os.path.dirname(os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__))))
+            output = subprocess.run([sys.executable, "-c", code],
+                                    cwd=root,
+                                    capture_output=True,
+                                    text=True,
+                                    check=True).stdout
+            self.assertEqual(output.strip(), "[]")
+
+        do_not_import_heavy_dependencies()